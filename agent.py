@@ -1,4 +1,6 @@
+import heapq
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 
@@ -6,24 +8,68 @@ from langchain_ollama import ChatOllama
 from langchain_core.tools import tool
 from langchain.agents import create_agent
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # -------- Global metadata cache -------- #
 
 METADATA: List[Dict[str, Any]] = []
 
+# Indexes precomputed at load time, metadata doesn't change between loads
+MAX_ACTIVE_REPOS = 50
+DOCKER_REPOS: List[str] = []
+NO_TEST_REPOS: List[str] = []
+ACTIVE_REPOS: List[str] = []  # "name (N commits)", most active first
+
+# (resolved dir, file signature) METADATA was loaded from, kept up to date by load_metadata
+_LOADED_FROM: tuple = ()
+
 
 # -------- Load metadata -------- #
 
+def _build_indexes(repos: List[Dict[str, Any]]) -> None:
+    global DOCKER_REPOS, NO_TEST_REPOS, ACTIVE_REPOS
+    DOCKER_REPOS = [r["name"] for r in repos if r.get("has_dockerfile")]
+    NO_TEST_REPOS = [r["name"] for r in repos if not r.get("has_tests")]
+
+    # Only the top entries are listed, a heap avoids sorting every repo
+    top_repos = heapq.nlargest(
+        MAX_ACTIVE_REPOS,
+        repos,
+        key=lambda r: r.get("commits_last_30_days", 0),
+    )
+    ACTIVE_REPOS = [
+        f"{r['name']} ({r.get('commits_last_30_days', 0)} commits)" for r in top_repos
+    ]
+
+
+def _load_one(file_path: Path) -> Dict[str, Any]:
+    data = file_path.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _metadata_signature(paths: List[Path]) -> tuple:
+    # (path, mtime) of every metadata file, changes whenever a file is added, removed or rewritten
+    return tuple(sorted((str(p), p.stat().st_mtime) for p in paths))
+
+
 def load_metadata(metadata_dir: str | Path) -> List[Dict[str, Any]]:
-    global METADATA
+    global METADATA, _LOADED_FROM
     metadata_dir = Path(metadata_dir)
-    repos = []
+    paths = list(metadata_dir.glob("*.json"))
+    # Taken before reading, a file rewritten meanwhile just triggers another reload
+    signature = _metadata_signature(paths)
 
-    for file_path in metadata_dir.glob("*.json"):
-        with file_path.open("r", encoding="utf-8") as f:
-            repos.append(json.load(f))
+    # Read files concurrently, cold-cache loads are dominated by disk round trips
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        repos = list(executor.map(_load_one, paths))
 
     METADATA = repos
+    _build_indexes(repos)
+    _LOADED_FROM = (str(metadata_dir.resolve()), signature)
     return repos
 
 
@@ -34,8 +80,7 @@ def list_repos_using_docker() -> str:
     """List repos that have a Dockerfile."""
     if not METADATA:
         return "No metadata loaded."
-    names = [r["name"] for r in METADATA if r.get("has_dockerfile")]
-    return "Repositories using Docker:\n- " + "\n- ".join(names) if names else "None"
+    return "Repositories using Docker:\n- " + "\n- ".join(DOCKER_REPOS) if DOCKER_REPOS else "None"
 
 
 @tool
@@ -43,8 +88,7 @@ def list_repos_missing_tests() -> str:
     """List repos missing test files."""
     if not METADATA:
         return "No metadata loaded."
-    names = [r["name"] for r in METADATA if not r.get("has_tests")]
-    return "Repositories missing tests:\n- " + "\n- ".join(names) if names else "None"
+    return "Repositories missing tests:\n- " + "\n- ".join(NO_TEST_REPOS) if NO_TEST_REPOS else "None"
 
 
 @tool
@@ -53,20 +97,11 @@ def list_most_active_repos() -> str:
     if not METADATA:
         return "No metadata loaded."
 
-    sorted_repos = sorted(
-        METADATA,
-        key=lambda r: r.get("commits_last_30_days", 0),
-        reverse=True,
-    )
-
-    if not sorted_repos:
+    if not ACTIVE_REPOS:
         return "No active repositories found."
 
     # Format into a user-friendly sentence
-    repo_strings = [
-        f"{r['name']} ({r.get('commits_last_30_days', 0)} commits)" for r in sorted_repos
-    ]
-    return f"The most active repositories are: {', '.join(repo_strings)}."
+    return f"The most active repositories are: {', '.join(ACTIVE_REPOS)}."
 
 
 TOOLS = [list_repos_using_docker, list_repos_missing_tests, list_most_active_repos]
@@ -74,10 +109,7 @@ TOOLS = [list_repos_using_docker, list_repos_missing_tests, list_most_active_rep
 
 # -------- Agent Builder (LangChain v1) -------- #
 
-def create_repo_agent(metadata_dir: str | Path):
-    # Load metadata first
-    load_metadata(metadata_dir)
-
+def _build_agent_graph():
     # Chat model
     llm = ChatOllama(model="llama3.1", temperature=0.0)
 
@@ -94,8 +126,35 @@ def create_repo_agent(metadata_dir: str | Path):
     return agent_graph
 
 
+def create_repo_agent(metadata_dir: str | Path):
+    # Load metadata first
+    load_metadata(metadata_dir)
+
+    return _get_agent_graph()
+
+
+# -------- Session cache -------- #
+
+# The tools read the module globals, so one graph serves every metadata directory
+_AGENT_GRAPH = None
+
+
+def _get_agent_graph():
+    global _AGENT_GRAPH
+    if _AGENT_GRAPH is None:
+        _AGENT_GRAPH = _build_agent_graph()
+    return _AGENT_GRAPH
+
+
 def run_agent_question(metadata_dir: str | Path, question: str) -> str:
-    agent_graph = create_repo_agent(metadata_dir)
+    metadata_dir = Path(metadata_dir)
+
+    # Reload only when METADATA doesn't already hold this directory's current files
+    current = (str(metadata_dir.resolve()), _metadata_signature(list(metadata_dir.glob("*.json"))))
+    if current != _LOADED_FROM:
+        load_metadata(metadata_dir)
+
+    agent_graph = _get_agent_graph()
     response = agent_graph.invoke({"messages": [{"role": "user", "content": question}]})
     # Get the last message from the agent
     return response["messages"][-1].content
@@ -1,8 +1,18 @@
-from agent import run_agent_question
 import argparse
 from pathlib import Path
 
-from scanner import scan_directory
+from scanner import DEFAULT_JOBS, scan_directory
+
+
+def positive_int(value):
+    """argparse type for options that need an integer >= 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def main():
@@ -33,6 +43,12 @@ def main():
         default="metadata",
         help="Directory to write metadata JSON files (default: metadata)",
     )
+    scan_parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=DEFAULT_JOBS,
+        help=f"Number of repositories to scan in parallel (default: {DEFAULT_JOBS}, CPU count - 1)",
+    )
 
         # --- ask command ---
     ask_parser = subparsers.add_parser(
@@ -62,7 +78,7 @@ def main():
         print(f"Writing metadata to: {output_dir}\n")
         
         # call Scanner
-        scan_directory(repos_dir, output_dir)
+        scan_directory(repos_dir, output_dir, jobs=args.jobs)
 
     elif args.command == "ask":
         metadata_dir = args.metadata_dir
@@ -71,6 +87,9 @@ def main():
         print(f"Using metadata from: {metadata_dir}")
         print(f"Question: {question}\n")
 
+        # Imported here so scans (and their spawned workers) never load langchain
+        from agent import run_agent_question
+
         answer = run_agent_question(metadata_dir, question)
         print("\n🧠 Agent answer:")
         print(answer)
@@ -5,24 +5,63 @@ Scans Git repositories and extracts metadata
 
 import os
 import json
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime, timedelta
-from git import Repo
 from collections import Counter
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Directories never worth descending into (dependencies, build output, caches)
+PRUNE = {
+    'venv', '.venv', 'node_modules', '__pycache__', 'target', 'dist', 'build',
+    '.git', '.tox', '.mypy_cache', '.pytest_cache', 'site-packages', 'vendor',
+}
+
+# Language by lowercase file extension, without the leading dot
+LANGUAGE_MAP = {
+    'py': 'Python',
+    'js': 'JavaScript',
+    'ts': 'TypeScript',
+    'java': 'Java',
+    'go': 'Go',
+    'rs': 'Rust',
+    'rb': 'Ruby',
+    'php': 'PHP',
+    'c': 'C',
+    'cpp': 'C++',
+    'cs': 'C#',
+    'sh': 'Shell',
+    'yaml': 'YAML',
+    'yml': 'YAML',
+    'json': 'JSON',
+    'md': 'Markdown',
+}
+
+# Leave one core free so a full scan doesn't saturate the machine
+DEFAULT_JOBS = max(1, (os.cpu_count() or 2) - 1)
+
+# Files larger than this are skipped when counting lines (usually generated or vendored)
+MAX_LOC_BYTES = 2 * 1024 * 1024
+
 
 class RepositoryScanner:
     """Scans a Git repository and extracts metadata"""
     
-    def __init__(self, repo_path):
+    def __init__(self, repo_path, max_loc_bytes=MAX_LOC_BYTES):
         """
         Initialize scanner with a repository path
         
         Args:
             repo_path: Path to the Git repository
+            max_loc_bytes: Size above which files are left out of line counts
         """
         self.repo_path = Path(repo_path)
-        self.repo = Repo(repo_path)
+        self.max_loc_bytes = max_loc_bytes
         self.metadata = {}
         
     def scan(self):
@@ -34,146 +73,204 @@ class RepositoryScanner:
         """
         print(f"Scanning repository: {self.repo_path.name}")
         
-        self.metadata = {
-            "name": self.repo_path.name,
-            "path": str(self.repo_path.absolute()),
-            "languages": self._count_languages(),
-            "loc_total": 0,  # Will be calculated
-            "commits_last_30_days": self._count_recent_commits(),
-            "top_authors": self._get_top_authors(),
-            "has_readme": self._check_file_exists("README.md"),
-            "has_claude": self._check_file_exists("CLAUDE.md"),
-            "has_license": self._check_file_exists("LICENSE") or self._check_file_exists("LICENSE.md"),
-            "has_tests": self._check_tests(),
-            "has_ci": self._check_ci(),
-            "has_dockerfile": self._check_file_exists("Dockerfile"),
-        }
+        # The metrics are independent and I/O bound, so run them concurrently
+        # (one thread per submitted task)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            tree_walk = executor.submit(self._walk_repo_once)
+            has_ci = executor.submit(self._check_ci)
+            
+            # Check for an empty repository once, while the walk runs, for both git queries
+            has_commits = self._has_commits()
+            recent_activity = executor.submit(self._get_recent_activity, has_commits=has_commits)
+            top_authors = executor.submit(self._get_top_authors, has_commits=has_commits)
+            
+            languages, has_tests, root_entries = tree_walk.result()
+            recent_commits, recent_authors = recent_activity.result()
+            
+            self.metadata = {
+                "name": self.repo_path.name,
+                "path": str(self.repo_path.absolute()),
+                "languages": languages,
+                "loc_total": 0,  # Will be calculated
+                "commits_last_30_days": recent_commits,
+                "top_authors": top_authors.result(),
+                "top_authors_last_30_days": recent_authors,
+                "has_readme": "README.md" in root_entries,
+                "has_claude": "CLAUDE.md" in root_entries,
+                "has_license": "LICENSE" in root_entries or "LICENSE.md" in root_entries,
+                "has_tests": has_tests,
+                "has_ci": has_ci.result(),
+                "has_dockerfile": "Dockerfile" in root_entries,
+            }
         
         # Calculate total lines of code
         self.metadata["loc_total"] = sum(self.metadata["languages"].values())
         
         return self.metadata
     
-    def _check_file_exists(self, filename):
-        """Check if a specific file exists in the repository root"""
-        return (self.repo_path / filename).exists()
-    
-    def _check_tests(self):
-        """Check if tests exist in the repository"""
-        # Check for tests/ directory
-        if (self.repo_path / "tests").exists():
-            return True
-        
-        # Check for test/ directory
-        if (self.repo_path / "test").exists():
-            return True
-        
-        # Check for files containing _test or test_
-        for root, dirs, files in os.walk(self.repo_path):
-            # Skip hidden directories and venv
-            if any(part.startswith('.') or part == 'venv' for part in Path(root).parts):
-                continue
-            
-            for file in files:
-                if '_test' in file or 'test_' in file:
-                    return True
-        
-        return False
-    
     def _check_ci(self):
         """Check if GitHub Actions workflows exist"""
         ci_path = self.repo_path / ".github" / "workflows"
-        return ci_path.exists() and any(ci_path.iterdir())
+        try:
+            # Stop at the first entry instead of listing the whole directory
+            with os.scandir(ci_path) as entries:
+                return next(entries, None) is not None
+        except (FileNotFoundError, NotADirectoryError):
+            return False
     
-    def _count_languages(self):
+    def _walk_repo_once(self):
         """
-        Count lines of code by language
+        Walk the repository tree once, counting lines of code by language,
+        detecting tests and collecting root entry names in the same pass
         
         Returns:
-            dict: Language -> line count mapping
+            tuple: (Language -> line count mapping, whether tests exist,
+                    set of names in the repository root)
         """
-        language_map = {
-            '.py': 'Python',
-            '.js': 'JavaScript',
-            '.ts': 'TypeScript',
-            '.java': 'Java',
-            '.go': 'Go',
-            '.rs': 'Rust',
-            '.rb': 'Ruby',
-            '.php': 'PHP',
-            '.c': 'C',
-            '.cpp': 'C++',
-            '.cs': 'C#',
-            '.sh': 'Shell',
-            '.yaml': 'YAML',
-            '.yml': 'YAML',
-            '.json': 'JSON',
-            '.md': 'Markdown',
-        }
-        
         language_counts = Counter()
+        has_tests = False
+        root_entries = set()
+        language_for = LANGUAGE_MAP.get  # bound once, called per file
+        max_loc_bytes = self.max_loc_bytes
         
-        # Special case for Dockerfile
-        dockerfile_path = self.repo_path / "Dockerfile"
-        if dockerfile_path.exists():
+        # Walk through repository files with an explicit scandir stack
+        root_path = str(self.repo_path)
+        stack = [root_path]
+        while stack:
+            root = stack.pop()
             try:
-                with open(dockerfile_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    language_counts['Dockerfile'] = len(f.readlines())
-            except Exception:
-                pass
-        
-        # Walk through repository files
-        for root, dirs, files in os.walk(self.repo_path):
-            # Skip hidden directories, git, and virtual environments
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['venv', 'node_modules', '__pycache__']]
+                entries = list(os.scandir(root))
+            except OSError:
+                continue
+            
+            if root == root_path:
+                # Serves the root-level file probes without extra stat calls
+                root_entries = {entry.name for entry in entries}
             
-            for file in files:
-                file_path = Path(root) / file
-                extension = file_path.suffix.lower()
+            for entry in entries:
+                name = entry.name
+                
+                if entry.is_dir(follow_symlinks=False):
+                    # Prune hidden, dependency and build directories before descending
+                    if name in PRUNE or name.startswith('.'):
+                        continue
+                    # Check for tests/ or test/ directory at the repository root
+                    if not has_tests and root == root_path and name in ('tests', 'test'):
+                        has_tests = True
+                    stack.append(entry.path)
+                    continue
+                
+                # Check for files containing _test or test_
+                if not has_tests and ('_test' in name or 'test_' in name):
+                    has_tests = True
+                
+                # Special case for Dockerfile
+                if name == 'Dockerfile' and root == root_path:
+                    try:
+                        with open(entry.path, 'rb') as f:
+                            language_counts['Dockerfile'] = len(f.read().splitlines())
+                    except Exception:
+                        pass
+                    continue
+                
+                stem, dot, extension = name.rpartition('.')
+                if not stem:
+                    # No extension, or a dotfile such as .bashrc
+                    continue
                 
-                if extension in language_map:
+                language = language_for(extension.lower())
+                if language is not None:
                     try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            lines = len([line for line in f if line.strip()])  # Count non-empty lines
-                            language_counts[language_map[extension]] += lines
+                        # Don't read huge files at all, this also bounds the buffer below
+                        if entry.stat().st_size > max_loc_bytes:
+                            continue
+                        # Count non-empty lines on raw bytes to skip UTF-8 decoding
+                        with open(entry.path, 'rb') as f:
+                            lines = sum(1 for line in f.read().splitlines() if line.strip())
+                        language_counts[language] += lines
                     except Exception:
                         # Skip files that can't be read
                         continue
         
-        return dict(language_counts)
+        return dict(language_counts), has_tests, root_entries
     
-    def _count_recent_commits(self, days=30):
+    def _git(self, *args, ok_codes=(0,)):
         """
-        Count commits in the last N days
+        Run a git command against the repository
+        
+        Args:
+            *args: git subcommand and its arguments
+            ok_codes: Exit codes that count as success
+            
+        Returns:
+            subprocess.CompletedProcess: Finished command, output in .stdout
+            
+        Raises:
+            RuntimeError: If git exits with any other code (corrupt repository,
+                safe.directory refusal, missing objects, ...)
+        """
+        # Pin git to this repository, -C would search parent directories
+        # for a repository when this one is broken
+        result = subprocess.run(
+            ['git', f'--git-dir={self.repo_path / ".git"}', f'--work-tree={self.repo_path}', *args],
+            capture_output=True,
+            encoding='utf-8',
+            errors='replace',
+        )
+        if result.returncode not in ok_codes:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result
+    
+    def _has_commits(self):
+        """Check if HEAD resolves to a commit, False for an empty repository"""
+        # rev-parse exits with 1 for an unborn HEAD, anything else is a real error
+        return self._git('rev-parse', '--verify', '-q', 'HEAD', ok_codes=(0, 1)).returncode == 0
+    
+    def _get_recent_activity(self, days=30, limit=3, has_commits=None):
+        """
+        Count commits and get the top N commit authors of the last N days
         
         Args:
             days: Number of days to look back
+            limit: Number of top authors to return
+            has_commits: Result of _has_commits() if already known
             
         Returns:
-            int: Number of commits
+            tuple: (Number of commits, top recent author names)
         """
-        cutoff_date = datetime.now() - timedelta(days=days)
+        if has_commits is None:
+            has_commits = self._has_commits()
+        if not has_commits:
+            return 0, []
         
-        # Efficiently count commits after the cutoff date
-        commit_list = list(self.repo.iter_commits(after=cutoff_date))
-        return len(commit_list)
+        # One git call, one author name per commit since the cutoff date
+        # (--no-show-signature keeps log.showSignature gpg output out of the names)
+        output = self._git(
+            'log', '--no-show-signature', f'--since={days}.days', '--format=%an', 'HEAD'
+        ).stdout
+        authors = output.splitlines()
+        return len(authors), [author for author, count in Counter(authors).most_common(limit)]
     
-    def _get_top_authors(self, limit=3):
+    def _get_top_authors(self, limit=3, has_commits=None):
         """
         Get the top N commit authors
         
         Args:
             limit: Number of top authors to return
+            has_commits: Result of _has_commits() if already known
             
         Returns:
             list: Top author names
         """
-        author_counts = Counter()
+        if has_commits is None:
+            has_commits = self._has_commits()
+        if not has_commits:
+            return []
         
-        for commit in self.repo.iter_commits():
-            author_counts[commit.author.name] += 1
-        
-        return [author for author, count in author_counts.most_common(limit)]
+        # One author name per commit, counted here as iter_commits did
+        output = self._git('log', '--no-show-signature', '--format=%an', 'HEAD').stdout
+        # --format terminates every entry with a newline, so splitlines() keeps empty names
+        return [author for author, count in Counter(output.splitlines()).most_common(limit)]
     
     def save_metadata(self, output_dir):
         """
@@ -183,24 +280,62 @@ class RepositoryScanner:
             output_dir: Directory to save the metadata file
         """
         output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
         
         filename = f"{self.metadata['name']}.json"
         filepath = output_path / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.metadata, f, indent=2)
+        if orjson is not None:
+            data = orjson.dumps(self.metadata, option=orjson.OPT_INDENT_2)
+        else:
+            # ensure_ascii=False matches orjson byte for byte (raw UTF-8, no \u escapes)
+            data = json.dumps(self.metadata, indent=2, ensure_ascii=False).encode('utf-8')
+        
+        # Pre-serialized bytes go out in a single write (looping only on a short write)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        try:
+            fd = os.open(filepath, flags, 0o644)
+        except FileNotFoundError:
+            # Only create the output directory when it is actually missing
+            output_path.mkdir(parents=True, exist_ok=True)
+            fd = os.open(filepath, flags, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                if written == 0:
+                    raise OSError(f"Could not write metadata to {filepath}")
+                view = view[written:]
+        finally:
+            os.close(fd)
         
         print(f"Saved metadata to: {filepath}")
 
 
-def scan_directory(repos_dir, output_dir):
+def _scan_one(repo_path, output_dir):
+    """
+    Scan a single repository and save its metadata (process pool worker)
+    
+    Args:
+        repo_path: Path to the Git repository
+        output_dir: Directory to save the metadata file
+        
+    Returns:
+        str: Repository name
+    """
+    scanner = RepositoryScanner(repo_path)
+    scanner.scan()
+    scanner.save_metadata(output_dir)
+    return scanner.metadata["name"]
+
+
+def scan_directory(repos_dir, output_dir, jobs=None):
     """
     Scan all repositories in a directory
     
     Args:
         repos_dir: Directory containing Git repositories
         output_dir: Directory to save metadata files
+        jobs: Number of worker processes (default: DEFAULT_JOBS, CPU count - 1)
     """
     repos_path = Path(repos_dir)
     
@@ -220,13 +355,20 @@ def scan_directory(repos_dir, output_dir):
     
     print(f"Found {len(repos)} repositories to scan\n")
     
-    # Scan each repository
-    for repo_path in repos:
-        try:
-            scanner = RepositoryScanner(repo_path)
-            scanner.scan()
-            scanner.save_metadata(output_dir)
-            print()  
-        except Exception as e:
-            print(f"Error scanning {repo_path.name}: {str(e)}\n")
-            continue
\ No newline at end of file
+    # Create the output directory once instead of in every worker
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    if jobs is None:
+        jobs = DEFAULT_JOBS
+    print(f"Scanning with {jobs} workers\n")
+    
+    # Scan repositories in parallel, each worker writes its own JSON file
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(_scan_one, repo_path, output_dir): repo_path for repo_path in repos}
+        
+        # Errors are reported per repository, including a crashed worker (BrokenProcessPool)
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error scanning {futures[future].name}: {str(e)}")